@@ -7,8 +7,6 @@ Transparent AI-powered analysis for participatory urban development
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import json
 import sqlite3
@@ -628,6 +626,7 @@ def render_project_analysis():
 
 def render_risk_assessment():
     """Render risk assessment interface"""
+    import plotly.express as px
     st.markdown("### ⚖️ AI Risikoanalyse")
     
     if 'risk_analysis' not in st.session_state:
@@ -675,6 +674,7 @@ def render_risk_assessment():
 
 def render_stakeholder_analysis():
     """Render stakeholder analysis interface"""
+    import plotly.express as px
     st.markdown("### 👥 Interessentanalyse")
     
     if 'stakeholders' not in st.session_state:
@@ -760,6 +760,7 @@ def render_regulatory_compliance():
 
 def render_timeline_planning():
     """Render timeline planning interface"""
+    import plotly.graph_objects as go
     st.markdown("### ⏱️ AI Tidsplanlegging")
     
     if 'timeline' not in st.session_state:
@@ -5,8 +5,6 @@ Professional UI components with modern design principles
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 
 # Enhanced Oslo Design System
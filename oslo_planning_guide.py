@@ -5,8 +5,6 @@ Community-focused guide for transparent and participatory planning in Oslo
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 import pandas as pd
 
@@ -325,6 +323,7 @@ def render_strategier_foringer():
 
 def render_miljo_klima():
     """Render miljø og klima section"""
+    import plotly.graph_objects as go
     
     st.markdown("### 🌱 Miljø- og Klimaplaner")
     st.markdown("**🌍 Viktige for bærekraft** - påvirker alle utbyggingsprosjekter")
@@ -6,27 +6,26 @@ Test suite for Oslo Planning Premium database functionality
 import pytest
 import tempfile
 import os
+import re
+from urllib.parse import urlparse
 from oslo_planning_premium import OsloPlanningPremium
 
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+@pytest.fixture(scope="class")
+def system():
+    """Set up one in-memory test database shared by a class's read-only tests"""
+    return OsloPlanningPremium(":memory:")
+
 
 class TestOsloPlanningDatabase:
     """Test cases for the Oslo Planning Premium database"""
     
-    def setup_method(self):
-        """Set up test database with temporary file"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.system = OsloPlanningPremium(self.temp_db.name)
-    
-    def teardown_method(self):
-        """Clean up test database"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-    
-    def test_database_initialization(self):
+    def test_database_initialization(self, system):
         """Test that database initializes correctly"""
-        docs = self.system.get_all_documents()
-        categories = self.system.get_categories()
+        docs = system.get_all_documents()
+        categories = system.get_categories()
         
         # Basic assertions
         assert len(docs) > 0, "Database should contain documents"
@@ -41,9 +40,9 @@ class TestOsloPlanningDatabase:
         for col in required_cat_columns:
             assert col in categories.columns, f"Missing required column: {col}"
     
-    def test_no_duplicates(self):
+    def test_no_duplicates(self, system):
         """Test that there are no duplicate documents"""
-        docs = self.system.get_all_documents()
+        docs = system.get_all_documents()
         
         # Check for duplicate titles
         duplicate_titles = docs['title'].duplicated().sum()
@@ -52,24 +51,26 @@ class TestOsloPlanningDatabase:
         # Check for unique document hashes
         unique_hashes = docs['document_hash'].nunique()
         assert unique_hashes == len(docs), "Document hashes should be unique"
-    
-    def test_url_format(self):
+        assert system.count_duplicate_hashes() == 0, "SQL duplicate count should agree"
+
+    def test_url_format(self, system):
         """Test that all URLs are properly formatted"""
-        docs = self.system.get_all_documents()
+        docs = system.get_all_documents()
         
         # Check that all URLs are present
         missing_urls = docs['url'].isna().sum()
         assert missing_urls == 0, f"Found {missing_urls} documents without URLs"
         
         # Check URL format
-        for _, doc in docs.iterrows():
-            url = doc['url']
-            assert url.startswith('https://oslo.kommune.no'), f"Invalid URL format: {url}"
+        urls = docs['url'].fillna('')
+        on_oslo_host = urls.map(lambda u: ('.' + (urlparse(u).hostname or '')).endswith('.oslo.kommune.no'))
+        invalid_urls = docs.loc[~(urls.str.startswith('https://') & on_oslo_host), 'url']
+        assert invalid_urls.empty, f"Invalid URL format: {invalid_urls.tolist()}"
     
-    def test_category_coverage(self):
+    def test_category_coverage(self, system):
         """Test that all categories are properly covered"""
-        docs = self.system.get_all_documents()
-        categories = self.system.get_categories()
+        docs = system.get_all_documents()
+        categories = system.get_categories()
         
         # Get unique categories from documents
         doc_categories = set(docs['category'].unique())
@@ -79,9 +80,9 @@ class TestOsloPlanningDatabase:
         missing_categories = doc_categories - cat_names
         assert len(missing_categories) == 0, f"Missing categories: {missing_categories}"
     
-    def test_data_quality(self):
+    def test_data_quality(self, system):
         """Test data quality metrics"""
-        docs = self.system.get_all_documents()
+        docs = system.get_all_documents()
         
         # Check title quality
         short_titles = docs[docs['title'].str.len() < 10]
@@ -95,40 +96,65 @@ class TestOsloPlanningDatabase:
         missing_departments = docs['responsible_department'].isna().sum()
         assert missing_departments == 0, "All documents should have assigned departments"
     
-    def test_search_functionality(self):
+    def test_search_functionality(self, system):
         """Test search functionality"""
         # Test basic search
-        results = self.system.search_documents("kommuneplan")
+        results = system.search_documents("kommuneplan")
         assert len(results) > 0, "Search should return results for 'kommuneplan'"
         
         # Verify search results contain the search term
-        found_term = False
-        for _, doc in results.iterrows():
-            if "kommuneplan" in doc['title'].lower() or "kommuneplan" in doc['description'].lower():
-                found_term = True
-                break
+        found_term = (
+            results['title'].str.contains('kommuneplan', case=False) |
+            results['description'].str.contains('kommuneplan', case=False)
+        ).any()
         assert found_term, "Search results should contain the search term"
         
         # Test empty search
-        empty_results = self.system.search_documents("nonexistent_term_12345")
+        empty_results = system.search_documents("nonexistent_term_12345")
         assert len(empty_results) == 0, "Search for non-existent term should return empty results"
     
-    def test_category_filtering(self):
+    def test_category_filtering(self, system):
         """Test category-based document filtering"""
-        categories = self.system.get_categories()
+        categories = system.get_categories()
         
         # Test filtering by each category
-        for _, category in categories.iterrows():
-            cat_name = category['category_name']
-            filtered_docs = self.system.get_documents_by_category(cat_name)
+        for cat_name in categories['category_name']:
+            filtered_docs = system.get_documents_by_category(cat_name)
             
             # Check that all returned documents belong to the category
-            for _, doc in filtered_docs.iterrows():
-                assert doc['category'] == cat_name, f"Document {doc['title']} should be in category {cat_name}"
+            mismatched = filtered_docs[filtered_docs['category'] != cat_name]
+            assert mismatched.empty, f"Documents {mismatched['title'].tolist()} should be in category {cat_name}"
     
-    def test_document_priorities(self):
+    def test_combined_filters(self, system):
+        """Test SQL-side filtering by category, status, priority and search term"""
+        results = system.get_documents(category='Byutvikling', status='Vedtatt', priority=3)
+        assert len(results) > 0, "Should find approved high priority Byutvikling documents"
+        assert (results['category'] == 'Byutvikling').all()
+        assert (results['status'] == 'Vedtatt').all()
+        assert (results['priority'] == 3).all()
+        
+        results = system.get_documents(search='klima', status='Vedtatt')
+        docs = system.get_all_documents()
+        expected = docs[
+            (docs['status'] == 'Vedtatt') &
+            (docs['title'].str.contains('klima', case=False) |
+             docs['description'].str.contains('klima', case=False) |
+             docs['tags'].str.contains('klima', case=False))
+        ]
+        assert set(results['title']) == set(expected['title'])
+    
+    def test_categorical_columns(self, system):
+        """Test that loaded documents use compact categorical and integer dtypes"""
+        for docs in (system.get_all_documents(), system.get_documents(status='Vedtatt')):
+            for col in ('category', 'status', 'document_type', 'responsible_department', 'verification_status'):
+                assert docs[col].dtype == 'category', f"{col} should be categorical"
+            assert docs['priority'].dtype == 'int8'
+            assert docs['year'].dtype == 'Int16'
+            assert (docs['status'] == 'Vedtatt').sum() == (docs['status'].astype(str) == 'Vedtatt').sum()
+
+    def test_document_priorities(self, system):
         """Test document priority assignment"""
-        docs = self.system.get_all_documents()
+        docs = system.get_all_documents()
         
         # Check priority range
         priorities = docs['priority'].unique()
@@ -140,9 +166,9 @@ class TestOsloPlanningDatabase:
         high_priority = docs[docs['priority'] >= 3]
         assert len(high_priority) > 0, "Should have high priority documents"
     
-    def test_status_values(self):
+    def test_status_values(self, system):
         """Test document status values"""
-        docs = self.system.get_all_documents()
+        docs = system.get_all_documents()
         
         # Check valid status values
         valid_statuses = {'Vedtatt', 'Under behandling', 'Under revisjon', 'Høring'}
@@ -150,17 +176,31 @@ class TestOsloPlanningDatabase:
         invalid_statuses = doc_statuses - valid_statuses
         assert len(invalid_statuses) == 0, f"Invalid statuses found: {invalid_statuses}"
     
-    def test_date_formats(self):
+    def test_date_formats(self, system):
         """Test date format consistency"""
-        docs = self.system.get_all_documents()
-        
-        # Check date format (YYYY-MM-DD)
-        import re
-        date_pattern = r'^\d{4}-\d{2}-\d{2}$'
+        docs = system.get_all_documents()
         
-        for _, doc in docs.iterrows():
-            if doc['date_published']:
-                assert re.match(date_pattern, doc['date_published']), f"Invalid date format: {doc['date_published']}"
+        # Check date format (YYYY-MM-DD) of every published date at once
+        dates = docs['date_published'].dropna()
+        dates = dates[dates != '']
+        invalid_dates = dates[~dates.str.match(DATE_PATTERN)]
+        assert invalid_dates.empty, f"Invalid date formats: {invalid_dates.tolist()}"
+
+    def test_hash_document_file(self):
+        """Test content hashing of document files"""
+        import hashlib
+        from oslo_planning_premium import hash_document_file
+
+        content = b"Kommuneplan for Oslo 2020-2035\n" * 1000
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
+        temp_file.write(content)
+        temp_file.close()
+
+        try:
+            assert hash_document_file(temp_file.name) == hashlib.blake2b(content).hexdigest()
+            assert hash_document_file(temp_file.name, 'sha256') == hashlib.sha256(content).hexdigest()
+        finally:
+            os.unlink(temp_file.name)
 
 
 class TestSystemIntegration:
@@ -182,7 +222,38 @@ class TestSystemIntegration:
         assert len(categories) > 0
         assert isinstance(search_results, type(docs))
         assert isinstance(filtered_docs, type(docs))
-    
+
+    def test_document_summaries(self):
+        """Test precomputed summary counts against direct filtering"""
+        from oslo_planning_premium import summarize_documents, summarize_categories
+
+        system = OsloPlanningPremium(":memory:")
+        docs = system.get_all_documents()
+
+        summary = summarize_documents(docs)
+        assert summary['total'] == len(docs)
+        assert summary['vedtatt'] == len(docs[docs['status'] == 'Vedtatt'])
+        assert summary['high_priority'] == len(docs[docs['priority'] >= 3])
+
+        cat_summary = summarize_categories(docs)
+        expected_total = docs['category'].value_counts().reindex(cat_summary.index)
+        expected_completed = docs.loc[docs['status'] == 'Vedtatt', 'category'].value_counts().reindex(
+            cat_summary.index, fill_value=0
+        )
+        assert set(cat_summary.index) == set(docs['category'])
+        assert (cat_summary['total'] == expected_total).all()
+        assert (cat_summary['completed'] == expected_completed).all()
+
+    def test_missing_publication_date(self):
+        """Test that documents without a publication date still load"""
+        system = OsloPlanningPremium(":memory:")
+        system.conn.execute("UPDATE oslo_planning_documents SET date_published = NULL WHERE id = 1")
+        system.conn.commit()
+
+        docs = system.get_all_documents()
+        assert docs['year'].isna().sum() == 1
+        assert docs['date_published'].isna().sum() == 1
+
     def test_concurrent_access(self):
         """Test concurrent database access"""
         import threading
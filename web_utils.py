@@ -5,44 +5,108 @@ Handles web requests with proper headers to avoid robots.txt restrictions
 """
 
 import requests
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+# How long a host's parsed robots.txt is reused before it is fetched again
+ROBOTS_TTL = 3600.0
+
+# How long a robots.txt download that failed or timed out is remembered before it is retried
+ROBOTS_FAILURE_TTL = 300.0
+
+# Upper bounds on a robots.txt download: bytes read and seconds waited
+ROBOTS_MAX_BYTES = 64 * 1024
+ROBOTS_TIMEOUT = 5
 
 class WebFetcher:
     """Web fetcher with robots.txt compliance and proper headers"""
     
     def __init__(self):
-        self.session = requests.Session()
-        
         # Set proper headers to avoid being blocked
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Oslo-Planning-Premium/1.0 (Planning Document Research; contact@oslo.kommune.no)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'no,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            # gzip and deflate, plus br and zstd when a decoder for them is installed
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
+        self._local = threading.local()
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_delay = 1.0  # Minimum 1 second between requests
+        # Rate limiting, per host so bulk checks can run different hosts in parallel
+        self.min_delay = 1.0  # Minimum 1 second between requests to the same host
+        self._next_request_time: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
+        
+        # Parsed robots.txt per scheme://host, with the monotonic time it expires.
+        # One lock per host so concurrent checks on that host wait for a single download
+        self._robots: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+    
+    @property
+    def session(self) -> requests.Session:
+        """This thread's session; requests.Session is not documented as thread-safe"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+    
+    def _robots_parser(self, host: str) -> RobotFileParser:
+        """Return the host's parsed robots.txt, downloading it once per ROBOTS_TTL"""
+        cached = self._robots.get(host)
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        with self._rate_lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            # Another thread may have loaded it while this one waited for the lock
+            cached = self._robots.get(host)
+            if cached is None or time.monotonic() >= cached[1]:
+                try:
+                    cached = (self._read_robots(host), time.monotonic() + ROBOTS_TTL)
+                except Exception:
+                    # If we can't check robots.txt, assume we can fetch, but don't
+                    # make every URL on an unreachable host wait for another timeout
+                    rp = RobotFileParser()
+                    rp.allow_all = True
+                    cached = (rp, time.monotonic() + ROBOTS_FAILURE_TTL)
+                self._robots[host] = cached
+            return cached[0]
+    
+    def _read_robots(self, host: str) -> RobotFileParser:
+        """Fetch and parse a host's robots.txt, reading at most ROBOTS_MAX_BYTES of it"""
+        rp = RobotFileParser(f"{host}/robots.txt")
+        response = self.session.get(rp.url, timeout=ROBOTS_TIMEOUT, stream=True)
+        try:
+            # Same outcome as RobotFileParser.read() and can_fetch(): 401, 403 and server
+            # errors disallow everything, any other 4xx means there are no rules
+            if response.status_code in (401, 403) or response.status_code >= 500:
+                rp.disallow_all = True
+            elif response.status_code >= 400:
+                rp.allow_all = True
+            else:
+                body = response.raw.read(ROBOTS_MAX_BYTES, decode_content=True)
+                rp.parse(body.decode('utf-8', errors='replace').splitlines())
+        finally:
+            response.close()
+        return rp
     
     def can_fetch(self, url: str) -> bool:
         """Check if we can fetch from URL according to robots.txt"""
         try:
-            from urllib.parse import urljoin, urlparse
-            
             parsed = urlparse(url)
-            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-            
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
+            rp = self._robots_parser(f"{parsed.scheme}://{parsed.netloc}")
             
             # Check with our user agent
-            user_agent = self.session.headers.get('User-Agent', '*')
+            user_agent = self.headers.get('User-Agent', '*')
             return rp.can_fetch(user_agent, url)
             
         except Exception:
@@ -57,15 +121,17 @@ class WebFetcher:
             print(f"⚠️ Robots.txt disallows fetching {url}")
             return None
         
-        # Rate limiting
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_delay:
-            time.sleep(self.min_delay - time_since_last)
+        # Rate limiting: reserve this host's next slot, then wait for it outside the lock
+        host = urlparse(url).netloc
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_time.get(host, now))
+            self._next_request_time[host] = slot + self.min_delay
+        if slot > now:
+            time.sleep(slot - now)
         
         try:
             response = self.session.get(url, **kwargs)
-            self.last_request_time = time.time()
             
             print(f"✅ Fetched {url} - Status: {response.status_code}")
             return response
@@ -81,6 +147,11 @@ def fetch_url(url: str, **kwargs) -> Optional[requests.Response]:
     """Convenience function to fetch URL with proper headers and robots.txt compliance"""
     return web_fetcher.get(url, **kwargs)
 
+def fetch_many(urls: List[str], max_workers: int = 8, **kwargs) -> List[Optional[requests.Response]]:
+    """Fetch several URLs concurrently, keeping the per-host delay, in the order given"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: web_fetcher.get(url, **kwargs), urls))
+
 def check_url_accessibility(url: str) -> Dict[str, Any]:
     """Check if URL is accessible and gather information"""
     result = {
@@ -115,6 +186,11 @@ def check_url_accessibility(url: str) -> Dict[str, Any]:
     
     return result
 
+def check_urls_accessibility(urls: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+    """Check several URLs concurrently, in the order given"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(check_url_accessibility, urls))
+
 if __name__ == "__main__":
     # Test the web fetcher
     test_urls = [
@@ -124,8 +200,7 @@ if __name__ == "__main__":
     ]
     
     print("🧪 Testing URL accessibility:")
-    for url in test_urls:
-        result = check_url_accessibility(url)
+    for url, result in zip(test_urls, check_urls_accessibility(test_urls)):
         print(f"   {url}")
         print(f"   Robots.txt: {'✅' if result['robots_allowed'] else '❌'}")
         print(f"   Accessible: {'✅' if result['accessible'] else '❌'}")